@@ -7,22 +7,18 @@ Este script:
 - Lee el CSV de fixtures (FT)
 - Calcula puntos y puntos por partido (PPG) como local y como visitante
 - Genera un gráfico: Top 10 equipos con mayor diferencia (PPG Local - PPG Visita)
+- Marca los equipos cuyo gap es significativo por bootstrap (IC 95% + p-value)
 """
 
 import pandas as pd
 import matplotlib.pyplot as plt
 
-CSV_PATH = "data/primera_division_2024_fixtures.csv"
+from storage import FIXTURES_DATASET, read_dataset, atomic_savefig
 
-print(">>> Cargando datos...")
-df = pd.read_csv(CSV_PATH)
+from ppg_bootstrap import bootstrap_ppg_gap, ALPHA, N_BOOT
 
-# Solo partidos finalizados
-df = df[df["status"] == "FT"].copy()
+OUT_PNG = "data/home_vs_away_ppg_gap_2024.png"
 
-# Asegurar numéricos
-df["home_goals"] = pd.to_numeric(df["home_goals"], errors="coerce")
-df["away_goals"] = pd.to_numeric(df["away_goals"], errors="coerce")
 
 # -----------------------
 # Funciones de puntos
@@ -47,79 +43,143 @@ def points_for(home_goals, away_goals, side: str) -> int:
 # -----------------------
 # Construcción por equipo
 # -----------------------
-teams = pd.unique(df[["home_team", "away_team"]].values.ravel())
-rows = []
+def build_home_away_table(df):
+    """
+    Tabla por equipo con puntos y PPG como local / visitante y su gap.
+    """
+    # Solo partidos finalizados
+    df = df[df["status"] == "FT"].copy()
+
+    # Asegurar numéricos
+    df["home_goals"] = pd.to_numeric(df["home_goals"], errors="coerce")
+    df["away_goals"] = pd.to_numeric(df["away_goals"], errors="coerce")
 
-for team in teams:
-    home_games = df[df["home_team"] == team]
-    away_games = df[df["away_team"] == team]
+    teams = pd.unique(df[["home_team", "away_team"]].values.ravel())
+    rows = []
 
-    home_points = sum(points_for(r.home_goals, r.away_goals, "home") for r in home_games.itertuples())
-    away_points = sum(points_for(r.home_goals, r.away_goals, "away") for r in away_games.itertuples())
+    for team in teams:
+        home_games = df[df["home_team"] == team]
+        away_games = df[df["away_team"] == team]
 
-    home_matches = len(home_games)
-    away_matches = len(away_games)
+        home_points = sum(points_for(r.home_goals, r.away_goals, "home") for r in home_games.itertuples())
+        away_points = sum(points_for(r.home_goals, r.away_goals, "away") for r in away_games.itertuples())
 
-    home_ppg = home_points / home_matches if home_matches > 0 else 0
-    away_ppg = away_points / away_matches if away_matches > 0 else 0
+        home_matches = len(home_games)
+        away_matches = len(away_games)
 
-    rows.append({
-        "team": team,
-        "home_matches": home_matches,
-        "away_matches": away_matches,
-        "home_points": home_points,
-        "away_points": away_points,
-        "home_ppg": home_ppg,
-        "away_ppg": away_ppg,
-        "ppg_gap": home_ppg - away_ppg
-    })
+        home_ppg = home_points / home_matches if home_matches > 0 else 0
+        away_ppg = away_points / away_matches if away_matches > 0 else 0
 
-teams_df = pd.DataFrame(rows)
+        rows.append({
+            "team": team,
+            "home_matches": home_matches,
+            "away_matches": away_matches,
+            "home_points": home_points,
+            "away_points": away_points,
+            "home_ppg": home_ppg,
+            "away_ppg": away_ppg,
+            "ppg_gap": home_ppg - away_ppg
+        })
 
-# Top 10 mayor diferencia (más dependientes del local)
-top10 = teams_df.sort_values("ppg_gap", ascending=False).head(10).copy()
+    return pd.DataFrame(rows)
 
-print("\n📊 TOP 10 EQUIPOS CON MAYOR GAP (PPG Local - PPG Visita)")
-print(top10[["team", "home_ppg", "away_ppg", "ppg_gap"]])
 
 # -----------------------
 # Gráfico
 # -----------------------
-colors = ["#276048"] * len(top10)  # verde base de tu marca
+def plot_top10(top10):
+    """
+    Barras horizontales: Top 10 equipos por gap de PPG.
+    Si top10 trae columnas de bootstrap (ci_low, ci_high, significant), se
+    dibuja el IC y se resaltan los equipos con gap significativo.
+    Retorna la figura; guardar/mostrar queda a cargo de quien llama.
+    """
+    has_ci = {"ci_low", "ci_high", "significant"}.issubset(top10.columns)
+
+    if has_ci:
+        significant = top10["significant"].astype(bool).tolist()
+        colors = ["#276048" if s else "#A9C5B8" for s in significant]
+    else:
+        significant = [False] * len(top10)
+        colors = ["#276048"] * len(top10)  # verde base de tu marca
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    ax.barh(top10["team"], top10["ppg_gap"], color=colors)
+
+    if has_ci:
+        xerr = [top10["ppg_gap"] - top10["ci_low"], top10["ci_high"] - top10["ppg_gap"]]
+        ax.errorbar(top10["ppg_gap"], range(len(top10)), xerr=xerr,
+                    fmt="none", ecolor="#555555", elinewidth=1, capsize=3)
+
+    ax.set_title("Dependencia de Localía – Liga Promerica 2024\n(PPG Local - PPG Visita) | Top 10",
+                 fontsize=15, fontweight="bold", pad=20)
+    ax.set_xlabel("Diferencia de Puntos por Partido (PPG)")
+
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.grid(axis="x", linestyle="--", alpha=0.3)
+
+    ax.invert_yaxis()
+
+    # Etiquetas al final de cada barra (o del IC, si se dibujó)
+    label_x = top10["ci_high"] if has_ci else top10["ppg_gap"]
+    for i, (v, x) in enumerate(zip(top10["ppg_gap"], label_x)):
+        mark = " *" if significant[i] else ""
+        ax.text(x + 0.02, i, f"{v:.2f}{mark}", va="center", fontsize=10, fontweight="bold")
+
+    # Insight (simple y publicable)
+    best_team = top10.iloc[0]["team"]
+    best_gap = top10.iloc[0]["ppg_gap"]
+
+    insight = f"Insight: {best_team} muestra la mayor dependencia de localía (gap {best_gap:.2f} PPG)."
+    if has_ci and not significant[0]:
+        insight += " No es significativo."
+    fig.text(
+        0.35, 0.07 if has_ci else 0.13,
+        insight,
+        ha="left",
+        fontsize=11,
+        bbox=dict(boxstyle="round,pad=0.4", facecolor="white", edgecolor="#CFCFCF")
+    )
+
+    if has_ci:
+        fig.text(0.01, 0.01, f"* gap significativo (bootstrap, p < {ALPHA}) | líneas: IC {1 - ALPHA:.0%}",
+                 ha="left", fontsize=8, color="gray")
+
+    fig.text(0.99, 0.01, "Fuente: API-Football | Season 2024", ha="right", fontsize=8, color="gray")
+
+    plt.tight_layout()
+    if has_ci:
+        # espacio extra abajo para que el insight no tape las barras/IC
+        fig.subplots_adjust(bottom=0.2)
+    return fig
+
 
-fig, ax = plt.subplots(figsize=(10, 6))
+def main():
+    print(">>> Cargando datos...")
+    df = read_dataset(FIXTURES_DATASET)
 
-ax.barh(top10["team"], top10["ppg_gap"], color=colors)
+    teams_df = build_home_away_table(df)
 
-ax.set_title("Dependencia de Localía – Liga Promerica 2024\n(PPG Local - PPG Visita) | Top 10",
-             fontsize=15, fontweight="bold", pad=20)
-ax.set_xlabel("Diferencia de Puntos por Partido (PPG)")
+    # Significancia del gap (bootstrap)
+    boot = bootstrap_ppg_gap(df)
+    teams_df = teams_df.merge(boot[["team", "ci_low", "ci_high", "p_value", "significant"]], on="team", how="left")
 
-ax.spines["top"].set_visible(False)
-ax.spines["right"].set_visible(False)
-ax.grid(axis="x", linestyle="--", alpha=0.3)
+    # Top 10 mayor diferencia (más dependientes del local)
+    top10 = teams_df.sort_values("ppg_gap", ascending=False).head(10).copy()
 
-ax.invert_yaxis()
+    print("\n📊 TOP 10 EQUIPOS CON MAYOR GAP (PPG Local - PPG Visita)")
+    print(top10[["team", "home_ppg", "away_ppg", "ppg_gap"]])
 
-# Etiquetas al final de cada barra
-for i, v in enumerate(top10["ppg_gap"]):
-    ax.text(v + 0.02, i, f"{v:.2f}", va="center", fontsize=10, fontweight="bold")
+    print(f"\n📊 SIGNIFICANCIA DEL GAP (bootstrap, {N_BOOT} re-muestreos)")
+    print(top10[["team", "ppg_gap", "ci_low", "ci_high", "p_value", "significant"]])
 
-# Insight (simple y publicable)
-best_team = top10.iloc[0]["team"]
-best_gap = top10.iloc[0]["ppg_gap"]
+    plot_top10(top10)
 
-insight = f"Insight: {best_team} muestra la mayor dependencia de localía (gap {best_gap:.2f} PPG)."
-fig.text(
-    0.35, 0.13,
-    insight,
-    ha="left",
-    fontsize=11,
-    bbox=dict(boxstyle="round,pad=0.4", facecolor="white", edgecolor="#CFCFCF")
-)
+    atomic_savefig(plt.gcf(), OUT_PNG, dpi=300, bbox_inches="tight")
+    plt.show()
 
-fig.text(0.99, 0.01, "Fuente: API-Football | Season 2024", ha="right", fontsize=8, color="gray")
 
-plt.tight_layout()
-plt.savefig("data/home_vs_away_ppg_gap_2024.png", dpi=300, bbox_inches="tight")
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -7,142 +7,184 @@ Este script:
 - Lee el CSV de fixtures
 - Calcula estadísticas por equipo
 - Genera ranking ofensivo
+- Muestra la fuerza ajustada por rival y localía (Dixon-Coles)
+- Muestra ratings Massey / Colley y dificultad de calendario (SoS)
 """
 
 import pandas as pd
 import matplotlib.pyplot as plt
 
-CSV_PATH = "data/primera_division_2024_fixtures.csv"
+from storage import FIXTURES_DATASET, read_dataset, atomic_savefig
 
-print(">>> Cargando datos...")
-df = pd.read_csv(CSV_PATH)
+from team_strength import fit_team_strength, XI
+from ratings import compute_ratings
 
-# Filtrar partidos finalizados
-df = df[df["status"] == "FT"].copy()
+OUT_PNG = "data/top5_gf_vs_dg_2024.png"
 
-# ==========================
-# CONSTRUIR TABLA POR EQUIPO
-# ==========================
+team_colors = {
+    "CS Herediano": "#1B4332",
+    "Deportivo Saprissa": "#3A5A40",
+    "LD Alajuelense": "#344E41",
+    "CS Cartagines": "#2D6A4F",
+    "San Carlos": "#40916C",
+}
 
-teams_data = []
 
-teams = pd.unique(df[["home_team", "away_team"]].values.ravel())
+def build_teams_table(df):
+    """
+    Tabla por equipo (partidos, GF, GA, DG, goles por partido)
+    a partir de los partidos finalizados, ordenada por mejor ataque.
+    """
+    # Filtrar partidos finalizados
+    df = df[df["status"] == "FT"].copy()
 
-for team in teams:
+    # ==========================
+    # CONSTRUIR TABLA POR EQUIPO
+    # ==========================
 
-    home_games = df[df["home_team"] == team]
-    away_games = df[df["away_team"] == team]
+    teams_data = []
 
-    goals_for = home_games["home_goals"].sum() + away_games["away_goals"].sum()
-    goals_against = home_games["away_goals"].sum() + away_games["home_goals"].sum()
+    teams = pd.unique(df[["home_team", "away_team"]].values.ravel())
 
-    matches_played = len(home_games) + len(away_games)
+    for team in teams:
 
-    teams_data.append({
-        "team": team,
-        "matches": matches_played,
-        "goals_for": goals_for,
-        "goals_against": goals_against,
-        "goal_diff": goals_for - goals_against,
-        "goals_per_match": goals_for / matches_played if matches_played > 0 else 0
-    })
+        home_games = df[df["home_team"] == team]
+        away_games = df[df["away_team"] == team]
 
-teams_df = pd.DataFrame(teams_data)
+        goals_for = home_games["home_goals"].sum() + away_games["away_goals"].sum()
+        goals_against = home_games["away_goals"].sum() + away_games["home_goals"].sum()
 
-# Ordenar por mejor ataque
-teams_df = teams_df.sort_values(by="goals_for", ascending=False)
+        matches_played = len(home_games) + len(away_games)
 
-print("\n📊 TOP 5 ATAQUES 2024")
-print(teams_df.head())
+        teams_data.append({
+            "team": team,
+            "matches": matches_played,
+            "goals_for": goals_for,
+            "goals_against": goals_against,
+            "goal_diff": goals_for - goals_against,
+            "goals_per_match": goals_for / matches_played if matches_played > 0 else 0
+        })
 
-# ==========================
-# GRÁFICO: GOLES VS DIFERENCIA DE GOL (TOP 5)
-# ==========================
+    teams_df = pd.DataFrame(teams_data)
 
-top5 = teams_df.head(5).copy()
+    # Ordenar por mejor ataque
+    return teams_df.sort_values(by="goals_for", ascending=False)
 
-team_colors = {
-    "CS Herediano": "#1B4332",
-    "Deportivo Saprissa": "#3A5A40",
-    "LD Alajuelense": "#344E41",
-    "CS Cartagines": "#2D6A4F",
-    "San Carlos": "#40916C",
-}
 
-colors = [team_colors.get(t, "#1B4332") for t in top5["team"]]
-
-fig, ax = plt.subplots(figsize=(10, 6))
-
-scatter = ax.scatter(
-    top5["goals_for"],
-    top5["goal_diff"],
-    s=220,
-    c=colors,
-    edgecolors="black",
-    linewidths=1
-)
-
-# Título más equilibrado
-ax.set_title(
-    "Goles Anotados vs Diferencia de Gol\nLiga Promerica 2024 – Top 5",
-    fontsize=15,
-    fontweight="bold",
-    pad=20
-)
-
-ax.set_xlabel("Goles anotados (GF)", fontsize=12)
-ax.set_ylabel("Diferencia de gol (DG)", fontsize=12)
-
-# Líneas guía suaves
-ax.grid(axis="y", linestyle="--", alpha=0.3)
-
-# Quitar bordes innecesarios
-ax.spines["top"].set_visible(False)
-ax.spines["right"].set_visible(False)
-
-# Ajustar límites para dar aire
-ax.set_xlim(top5["goals_for"].min() - 2, top5["goals_for"].max() + 3)
-ax.set_ylim(top5["goal_diff"].min() - 3, top5["goal_diff"].max() + 3)
-
-# Etiquetas mejor posicionadas
-for _, row in top5.iterrows():
-
-    x = row["goals_for"]
-    y = row["goal_diff"]
-
-    ax.annotate(
-        f"{row['team']}\nGF:{int(x)} | DG:{int(y)}",
-        (x, y),
-        textcoords="offset points",
-        xytext=(8, 8),
-        fontsize=9
+def plot_top5(top5):
+    """
+    Gráfico: goles vs diferencia de gol para el Top 5 ofensivo.
+    Retorna la figura; guardar/mostrar queda a cargo de quien llama.
+    """
+    colors = [team_colors.get(t, "#1B4332") for t in top5["team"]]
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    scatter = ax.scatter(
+        top5["goals_for"],
+        top5["goal_diff"],
+        s=220,
+        c=colors,
+        edgecolors="black",
+        linewidths=1
     )
 
-# Insight más compacto y profesional
-insight = "Alajuelense no lidera en goles, pero sí en diferencia → eficiencia defensiva."
-
-fig.subplots_adjust(bottom=0.20)
-
-fig.text(
-    0.5,
-    0.12,
-    insight,
-    ha="center",
-    fontsize=10,
-    fontweight="bold",
-    bbox=dict(boxstyle="round,pad=0.4", facecolor="white", edgecolor="#678570")
-)
-
-# Footer profesional
-fig.text(
-    0.99,
-    0.01,
-    "Fuente: API-Football | Season 2024",
-    ha="right",
-    fontsize=8,
-    color="gray"
-)
-
-plt.tight_layout()
-plt.savefig("data/top5_gf_vs_dg_2024.png", dpi=300, bbox_inches="tight")
-plt.show() 
\ No newline at end of file
+    # Título más equilibrado
+    ax.set_title(
+        "Goles Anotados vs Diferencia de Gol\nLiga Promerica 2024 – Top 5",
+        fontsize=15,
+        fontweight="bold",
+        pad=20
+    )
+
+    ax.set_xlabel("Goles anotados (GF)", fontsize=12)
+    ax.set_ylabel("Diferencia de gol (DG)", fontsize=12)
+
+    # Líneas guía suaves
+    ax.grid(axis="y", linestyle="--", alpha=0.3)
+
+    # Quitar bordes innecesarios
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+
+    # Ajustar límites para dar aire
+    ax.set_xlim(top5["goals_for"].min() - 2, top5["goals_for"].max() + 3)
+    ax.set_ylim(top5["goal_diff"].min() - 3, top5["goal_diff"].max() + 3)
+
+    # Etiquetas mejor posicionadas
+    for _, row in top5.iterrows():
+
+        x = row["goals_for"]
+        y = row["goal_diff"]
+
+        ax.annotate(
+            f"{row['team']}\nGF:{int(x)} | DG:{int(y)}",
+            (x, y),
+            textcoords="offset points",
+            xytext=(8, 8),
+            fontsize=9
+        )
+
+    # Insight más compacto y profesional
+    insight = "Alajuelense no lidera en goles, pero sí en diferencia → eficiencia defensiva."
+
+    fig.subplots_adjust(bottom=0.20)
+
+    fig.text(
+        0.5,
+        0.12,
+        insight,
+        ha="center",
+        fontsize=10,
+        fontweight="bold",
+        bbox=dict(boxstyle="round,pad=0.4", facecolor="white", edgecolor="#678570")
+    )
+
+    # Footer profesional
+    fig.text(
+        0.99,
+        0.01,
+        "Fuente: API-Football | Season 2024",
+        ha="right",
+        fontsize=8,
+        color="gray"
+    )
+
+    plt.tight_layout()
+    return fig
+
+
+def main():
+    print(">>> Cargando datos...")
+    df = read_dataset(FIXTURES_DATASET)
+
+    teams_df = build_teams_table(df)
+
+    print("\n📊 TOP 5 ATAQUES 2024")
+    print(teams_df.head())
+
+    # GF / GA no ajustan por rival ni localía: modelo Dixon-Coles
+    strength = fit_team_strength(df, xi=XI)
+    print(f"\n📊 FUERZA AJUSTADA (Dixon-Coles) | localía: {strength['home_adv']:.3f}")
+    print(strength["teams"].merge(teams_df[["team", "goals_for", "goal_diff"]], on="team"))
+
+    # La DG cruda premia calendarios fáciles: Massey / Colley ajustan por rival
+    ratings = compute_ratings(df)
+    print("\n📊 RATINGS AJUSTADOS POR RIVAL (Massey / Colley + SoS)")
+    print(ratings.merge(teams_df[["team", "goal_diff"]], on="team")
+                 .sort_values("massey", ascending=False))
+
+    # ==========================
+    # GRÁFICO: GOLES VS DIFERENCIA DE GOL (TOP 5)
+    # ==========================
+
+    top5 = teams_df.head(5).copy()
+
+    plot_top5(top5)
+
+    atomic_savefig(plt.gcf(), OUT_PNG, dpi=300, bbox_inches="tight")
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 
-CSV_PATH = "data/primera_division_2024_fixtures.csv"
+from storage import FIXTURES_DATASET, read_dataset, atomic_write
+
 OUT_GIF = "data/tabla_clausura_2024_animada.gif"
 
 TOP_N = 12
@@ -147,7 +148,7 @@ def make_team_colors(teams):
 
 
 def main():
-    df = pd.read_csv(CSV_PATH)
+    df = read_dataset(FIXTURES_DATASET)
 
     # Solo FT
     df = df[df["status"] == "FT"].copy()
@@ -242,7 +243,8 @@ def main():
         repeat=False
     )
 
-    ani.save(OUT_GIF, writer="pillow", dpi=140)
+    # GIF completo o nada: se escribe a un temporal y se renombra
+    atomic_write(OUT_GIF, lambda tmp: ani.save(tmp, writer="pillow", dpi=140))
     plt.close(fig)
 
     print(f">>> GIF guardado en: {OUT_GIF}")
@@ -0,0 +1,105 @@
+"""
+chart_template.py
+
+Plantillas de figura reutilizables.
+
+La parte estática de un gráfico (tamaño, ejes en posiciones fijas, bordes,
+grillas, títulos fijos, ticks, footer, tarjeta de insight) se dibuja UNA vez
+y se guarda como fondo (bitmap). Luego, por cada equipo, solo se dibujan los
+artistas de datos (barras, líneas, textos) encima de ese fondo.
+
+- Layout fijo en coordenadas de figura: no hace falta bbox_inches="tight"
+  (que dibuja la figura dos veces para medir el contenido)
+- El fondo solo se vuelve a dibujar si cambia el "layout key" (ej. límites
+  de ejes de otra liga-temporada)
+- Usa Figure + FigureCanvasAgg directamente, sin el estado global de pyplot,
+  así cada proceso de un pool puede tener su propia plantilla
+"""
+
+import numpy as np
+from PIL import Image
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from storage import atomic_write
+
+FOOTER = "Fuente: API-Football | Season 2024"
+BRAND_GREEN = "#276048"
+
+PNG_COMPRESS_LEVEL = 3  # 0-9: menor = más rápido, archivo más grande
+
+
+def clean_axes(ax, grid_axis="y"):
+    """Estilo base del proyecto: sin bordes arriba/derecha y grilla suave."""
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    if grid_axis:
+        ax.grid(axis=grid_axis, linestyle="--", alpha=0.3)
+    ax.set_axisbelow(True)
+
+
+class FigureTemplate:
+    """
+    Base para plantillas. Las subclases implementan:
+    - build(): crea ejes y artistas; los de datos se registran con dynamic()
+    - layout_key(data) / apply_layout(data): lo que cambia el fondo (límites)
+    - update(data): solo actualiza los artistas de datos
+    """
+
+    figsize = (10, 6)
+    dpi = 150
+
+    def __init__(self):
+        self.fig = Figure(figsize=self.figsize, dpi=self.dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self._dynamic = []
+        self._background = None
+        self._layout_key = None
+        self.build()
+        self.footer = self.fig.text(0.99, 0.01, FOOTER, ha="right", fontsize=8, color="gray")
+
+    def build(self):
+        raise NotImplementedError
+
+    def update(self, data):
+        raise NotImplementedError
+
+    def layout_key(self, data):
+        return None
+
+    def apply_layout(self, data):
+        pass
+
+    def dynamic(self, artist):
+        """Marca un artista como de datos: no forma parte del fondo."""
+        artist.set_animated(True)
+        self._dynamic.append(artist)
+        return artist
+
+    def insight_box(self, x, y, **kwargs):
+        """Tarjeta de insight vacía; el texto se llena en update()."""
+        return self.dynamic(self.fig.text(
+            x, y, "",
+            bbox=dict(boxstyle="round,pad=0.5", facecolor="white", edgecolor="#D9D9D9"),
+            **kwargs
+        ))
+
+    def draw(self, data):
+        """Dibuja la tarjeta en el canvas reutilizando el fondo si se puede."""
+        key = self.layout_key(data)
+        if self._background is None or key != self._layout_key:
+            self.apply_layout(data)
+            self.canvas.draw()
+            self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+            self._layout_key = key
+        else:
+            self.canvas.restore_region(self._background)
+
+        self.update(data)
+        for artist in self._dynamic:
+            self.fig.draw_artist(artist)
+
+    def render(self, data, path):
+        self.draw(data)
+        image = Image.fromarray(np.asarray(self.canvas.buffer_rgba()))
+        atomic_write(path, lambda tmp: image.save(tmp, compress_level=PNG_COMPRESS_LEVEL))
@@ -7,13 +7,35 @@ fetch_fixtures.py
 
 from api_client import api_get
 import pandas as pd
-import os
+
+from storage import FIXTURES_DATASET, write_dataset, dataset_path
 
 # ==============================
 # CONFIGURACIÓN
 # ==============================
 LEAGUE_ID = 162
 SEASON = 2024
+TIMEZONE = "America/Costa_Rica"
+
+
+def fixture_to_row(match):
+    """
+    Convierte un item de /fixtures de la API en una fila plana del CSV.
+    """
+    fixture = match["fixture"]
+    teams = match["teams"]
+    goals = match["goals"]
+
+    return {
+        "match_id": fixture["id"],
+        "date": fixture["date"],
+        "home_team": teams["home"]["name"],
+        "away_team": teams["away"]["name"],
+        "home_goals": goals["home"],
+        "away_goals": goals["away"],
+        "status": fixture["status"]["short"],
+        "round": match["league"]["round"],
+    }
 
 def main():
     print(">>> Descargando fixtures...")
@@ -26,7 +48,7 @@ def main():
         params={
             "league": LEAGUE_ID,
             "season": SEASON,
-            "timezone": "America/Costa_Rica",
+            "timezone": TIMEZONE,
         }
     )
 
@@ -36,35 +58,15 @@ def main():
 # ==============================
 # PROCESAMIENTO DE DATOS
 # ==============================
-    rows = []
-    for match in fixtures:
-        fixture = match["fixture"]
-        teams = match["teams"]
-        goals = match["goals"]
-
-        rows.append({
-            "match_id": fixture["id"],
-            "date": fixture["date"],
-            "home_team": teams["home"]["name"],
-            "away_team": teams["away"]["name"],
-            "home_goals": goals["home"],
-            "away_goals": goals["away"],
-            "status": fixture["status"]["short"],
-            "round": match["league"]["round"],
-        })
+    rows = [fixture_to_row(match) for match in fixtures]
 
     df = pd.DataFrame(rows)
-    # ==============================
-    # CREAR CARPETA DATA SI NO EXISTE
-    # ==============================
-    if not os.path.exists("data"):
-        os.makedirs("data")
-    
-    # Guardamos archivo CSV
-    output_path = "data/primera_division_2024_fixtures.csv"
-    df.to_csv(output_path, index=False)
 
-    print(">>> CSV guardado en:", output_path)
+    # Guardamos una nueva versión del CSV (escritura atómica + lock):
+    # data/versions/<dataset>/vNNNNNN.csv y la ruta plana data/<dataset>.csv
+    version = write_dataset(FIXTURES_DATASET, df)
+
+    print(f">>> CSV guardado en: {dataset_path(FIXTURES_DATASET, version)} (versión {version})")
     print(df.head())
 
 if __name__ == "__main__":
@@ -0,0 +1,239 @@
+"""
+mock_api.py
+
+API-Football local (mock) que reproduce una jornada "en vivo".
+
+- Lee el CSV de fixtures ya descargado
+- Construye (o carga) un timeline de la jornada: inicio, goles, HT y FT por partido
+- Sirve /fixtures con los mismos parámetros que usa el proyecto:
+    league + season  -> temporada completa (la jornada aparece según el reloj)
+    live=<league>    -> solo partidos en juego
+    ids=<id-id-...>  -> partidos puntuales (ej. recién finalizados)
+
+Uso (desde SoccerData/):
+  python src/mock_api.py --round "Clausura - 22" --speed 60
+  BASE_URL=http://127.0.0.1:8765 APISPORTS_KEY=mock python src/watch_matchday.py
+"""
+
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from storage import FIXTURES_DATASET, read_dataset
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+ROUND = "Clausura - 22"
+SPEED = 60            # minutos de partido por minuto real (60 = 1 min de juego por segundo)
+KICKOFF_GAP_MIN = 15  # separación entre inicios de partido dentro de la jornada
+SEED = 2024
+
+LIVE_STATUSES = {"1H", "HT", "2H", "ET", "BT", "P", "LIVE", "INT", "SUSP"}
+
+
+def build_timeline(df, round_label, seed=SEED):
+    """
+    Genera un timeline reproducible para los partidos de una jornada,
+    respetando el marcador final que trae el CSV.
+    """
+    matches = df[df["round"] == round_label].sort_values("date")
+    if matches.empty:
+        raise RuntimeError(f"No hay partidos para la jornada '{round_label}' en el CSV.")
+
+    rng = random.Random(seed)
+    fixtures = []
+
+    for i, m in enumerate(matches.itertuples()):
+        hg, ag = int(m.home_goals), int(m.away_goals)
+
+        # minutos de gol al azar, repartidos entre local y visita
+        sides = ["home"] * hg + ["away"] * ag
+        rng.shuffle(sides)
+        minutes = sorted(rng.randint(1, 90) for _ in sides)
+
+        events = [{"minute": 0, "status": "1H", "home": 0, "away": 0}]
+        h = a = 0
+        ht_added = False
+        for minute, side in zip(minutes, sides):
+            if minute > 45 and not ht_added:
+                events.append({"minute": 45, "status": "HT", "home": h, "away": a})
+                events.append({"minute": 60, "status": "2H", "home": h, "away": a})
+                ht_added = True
+            if side == "home":
+                h += 1
+            else:
+                a += 1
+            # el reloj del partido se desplaza 15 min por el medio tiempo
+            events.append({
+                "minute": minute if minute <= 45 else minute + 15,
+                "status": "1H" if minute <= 45 else "2H",
+                "home": h,
+                "away": a,
+            })
+        if not ht_added:
+            events.append({"minute": 45, "status": "HT", "home": h, "away": a})
+            events.append({"minute": 60, "status": "2H", "home": h, "away": a})
+        events.append({"minute": 105, "status": "FT", "home": h, "away": a})
+
+        fixtures.append({
+            "match_id": int(m.match_id),
+            "kickoff_min": i * KICKOFF_GAP_MIN,
+            "events": events,
+        })
+
+    return {"round": round_label, "fixtures": fixtures}
+
+
+def fixture_state(tl_fixture, clock_min):
+    """
+    Estado (status, elapsed, goles) de un partido del timeline en el minuto dado.
+    """
+    t = clock_min - tl_fixture["kickoff_min"]
+    if t < 0:
+        return "NS", None, None, None
+
+    current = tl_fixture["events"][0]
+    for ev in tl_fixture["events"]:
+        if ev["minute"] <= t:
+            current = ev
+
+    if current["status"] == "FT":
+        elapsed = 90
+    elif t <= 45:
+        elapsed = int(t)
+    elif t < 60:
+        elapsed = 45
+    else:
+        elapsed = min(int(t - 15), 90)
+    return current["status"], elapsed, current["home"], current["away"]
+
+
+def row_to_fixture(row, status, elapsed, home_goals, away_goals):
+    """
+    Fila del CSV -> item con la forma de /fixtures de API-Football.
+    """
+    return {
+        "fixture": {
+            "id": int(row["match_id"]),
+            "date": row["date"],
+            "status": {"short": status, "elapsed": elapsed},
+        },
+        "league": {"round": row["round"]},
+        "teams": {
+            "home": {"name": row["home_team"]},
+            "away": {"name": row["away_team"]},
+        },
+        "goals": {"home": home_goals, "away": away_goals},
+    }
+
+
+class MockFixturesAPI:
+    """
+    Reloj + timeline de la jornada. Responde a /fixtures según el minuto actual.
+    """
+
+    def __init__(self, df, timeline, speed=SPEED):
+        self.df = df
+        self.rows = {int(r["match_id"]): r for r in df.to_dict("records")}
+        self.timeline = {f["match_id"]: f for f in timeline["fixtures"]}
+        self.speed = speed
+        self.started = time.monotonic()
+
+    def clock_min(self):
+        return (time.monotonic() - self.started) * self.speed / 60
+
+    def fixture(self, match_id):
+        row = self.rows[match_id]
+        tl = self.timeline.get(match_id)
+        if tl is None:
+            hg = None if pd.isna(row["home_goals"]) else int(row["home_goals"])
+            ag = None if pd.isna(row["away_goals"]) else int(row["away_goals"])
+            return row_to_fixture(row, row["status"], None, hg, ag)
+        return row_to_fixture(row, *fixture_state(tl, self.clock_min()))
+
+    def fixtures(self, params):
+        if "ids" in params:
+            ids = [int(x) for x in params["ids"].split("-") if x]
+            return [self.fixture(i) for i in ids if i in self.rows]
+
+        items = [self.fixture(i) for i in self.rows]
+        if "live" in params:
+            items = [f for f in items if f["fixture"]["status"]["short"] in LIVE_STATUSES]
+        return items
+
+
+def make_handler(api):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+            if url.path != "/fixtures":
+                self.send_error(404, "Endpoint no soportado por el mock")
+                return
+
+            items = api.fixtures(params)
+            body = json.dumps({
+                "get": "fixtures",
+                "parameters": params,
+                "results": len(items),
+                "response": items,
+            }).encode("utf-8")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            print(f">>> [mock {api.clock_min():5.1f}'] {fmt % args}")
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API-Football mock que reproduce una jornada.")
+    parser.add_argument("--csv", help="CSV de fixtures (por defecto, la versión actual del dataset)")
+    parser.add_argument("--round", default=ROUND)
+    parser.add_argument("--timeline", help="JSON de timeline (si no, se genera desde el CSV)")
+    parser.add_argument("--save-timeline", help="Guarda el timeline generado en este JSON")
+    parser.add_argument("--speed", type=float, default=SPEED)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args()
+
+    df = read_dataset(FIXTURES_DATASET) if args.csv is None else pd.read_csv(args.csv)
+
+    if args.timeline:
+        with open(args.timeline, encoding="utf-8") as f:
+            timeline = json.load(f)
+    else:
+        timeline = build_timeline(df, args.round)
+
+    if args.save_timeline:
+        with open(args.save_timeline, "w", encoding="utf-8") as f:
+            json.dump(timeline, f, indent=2)
+        print(">>> Timeline guardado en:", args.save_timeline)
+
+    api = MockFixturesAPI(df, timeline, speed=args.speed)
+    server = ThreadingHTTPServer((HOST, args.port), make_handler(api))
+
+    print(f">>> Mock API en http://{HOST}:{args.port} | jornada: {timeline['round']} | speed x{args.speed}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
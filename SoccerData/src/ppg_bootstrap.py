@@ -0,0 +1,190 @@
+"""
+ppg_bootstrap.py
+
+Significancia del gap de PPG (Local - Visita) por bootstrap.
+
+Con ~9 partidos de local y ~9 de visita por torneo, parte del ranking de
+"dependencia de localía" puede ser ruido. Este módulo:
+- Re-muestrea (con reemplazo) los resultados de local y de visita de cada equipo
+- Retorna el gap observado, su intervalo de confianza (percentil) y un p-value
+
+Todo se calcula en un solo bloque NumPy: los puntos por partido solo toman
+valores 0, 1 o 3, así que re-muestrear n partidos con reemplazo equivale a
+una extracción multinomial con los conteos observados. Se arma la
+distribución exacta de puntos de cada equipo y se muestrea por CDF inversa,
+sin loop por equipo ni por re-muestreo; la memoria es equipos x re-muestreos
+(no x partidos).
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from storage import FIXTURES_DATASET, read_dataset
+
+N_BOOT = 10_000
+ALPHA = 0.05
+SEED = 2024
+
+POINT_VALUES = np.array([0, 1, 3])
+
+
+def outcome_counts(df, by=None):
+    """
+    Conteos de partidos con 0 / 1 / 3 puntos por equipo, como local y como visita.
+    `by` permite agrupar además por liga/temporada (ej. ["league_id", "season"]).
+    Retorna (keys DataFrame, home_counts [T, 3], away_counts [T, 3]).
+    """
+    by = list(by or [])
+
+    df = df[df["status"] == "FT"].copy()
+    df["home_goals"] = pd.to_numeric(df["home_goals"], errors="coerce")
+    df["away_goals"] = pd.to_numeric(df["away_goals"], errors="coerce")
+    df = df.dropna(subset=["home_goals", "away_goals"])
+
+    diff = np.sign(df["home_goals"].to_numpy() - df["away_goals"].to_numpy())
+    # índice de resultado en POINT_VALUES: derrota=0, empate=1, victoria=2
+    home_idx = (diff + 1).astype(int)
+    away_idx = (1 - diff).astype(int)
+
+    long = pd.concat([
+        df[by].assign(team=df["home_team"].to_numpy(), side="home", outcome=home_idx),
+        df[by].assign(team=df["away_team"].to_numpy(), side="away", outcome=away_idx),
+    ], ignore_index=True)
+
+    counts = (
+        long.groupby(by + ["team", "side", "outcome"], sort=True).size()
+            .unstack(["side", "outcome"], fill_value=0)
+    )
+    counts = counts.reindex(
+        columns=pd.MultiIndex.from_product([["home", "away"], [0, 1, 2]]), fill_value=0
+    )
+
+    keys = counts.index.to_frame(index=False)
+    return keys, counts["home"].to_numpy(), counts["away"].to_numpy()
+
+
+def _points_distribution(counts):
+    """
+    Distribución exacta (bootstrap) de los puntos totales al re-muestrear los
+    n partidos de cada equipo: multinomial(n, p_derrota, p_empate, p_victoria)
+    evaluada en la grilla (victorias, empates) y acumulada en puntos = 3V + E.
+    Retorna pmf [T, 3 * max_n + 1].
+    """
+    n = counts.sum(axis=1)
+    m = int(n.max()) if len(n) else 0
+    size = 3 * m + 1
+
+    w = np.arange(m + 1)[None, :, None]
+    d = np.arange(m + 1)[None, None, :]
+    l = n[:, None, None] - w - d
+    valid = l >= 0
+    l = np.clip(l, 0, m)
+
+    logfact = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, m + 1)))])
+
+    # log(p) = -inf si el resultado nunca ocurrió; 0 * log(0) se toma como 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logp = np.log(counts / n[:, None])
+
+        def term(k, lp):
+            return np.where(k > 0, k * lp[:, None, None], 0.0)
+
+        logpmf = (
+            logfact[n][:, None, None] - logfact[w] - logfact[d] - logfact[l]
+            + term(w, logp[:, 2]) + term(d, logp[:, 1]) + term(l, logp[:, 0])
+        )
+        pmf_grid = np.where(valid, np.exp(logpmf), 0.0)
+
+    # acumular la grilla (V, E) en puntos 3V + E, todos los equipos en un bincount
+    T = len(n)
+    pts = np.broadcast_to(np.where(valid, 3 * w + d, 0), pmf_grid.shape)
+    flat = (np.arange(T)[:, None, None] * size + pts).ravel()
+    return np.bincount(flat, weights=pmf_grid.ravel(), minlength=T * size).reshape(T, size)
+
+
+def _resampled_ppg(counts, n_boot, rng):
+    """
+    PPG re-muestreado para todos los equipos a la vez: [n_boot, T].
+    Se muestrea por CDF inversa sobre la distribución exacta de puntos:
+    un solo searchsorted sobre las CDF de todos los equipos concatenadas.
+    Equipos sin partidos en ese lado quedan en 0 (igual que analyze_home_away).
+    """
+    n = counts.sum(axis=1)
+    T = len(n)
+
+    cdf = np.cumsum(_points_distribution(counts), axis=1)
+    cdf /= cdf[:, -1:]
+    size = cdf.shape[1]
+
+    offsets = np.arange(T)
+    flat_cdf = (cdf + offsets[:, None]).ravel()
+    # consultas agrupadas por equipo (T, n_boot): mejor localidad en el searchsorted
+    u = rng.random((T, n_boot)) + offsets[:, None]
+    points = (np.searchsorted(flat_cdf, u, side="right") - offsets[:, None] * size).T
+
+    return np.divide(points, n, out=np.zeros(points.shape), where=n > 0)
+
+
+def bootstrap_ppg_gap(df, n_boot=N_BOOT, alpha=ALPHA, seed=SEED, by=None):
+    """
+    Intervalo de confianza y p-value del gap PPG (Local - Visita) por equipo.
+
+    - ci_low / ci_high: percentiles alpha/2 y 1-alpha/2 del gap re-muestreado
+    - p_value: bootstrap centrado (H0: gap = 0), dos colas
+    - significant: p_value < alpha
+    """
+    keys, home_counts, away_counts = outcome_counts(df, by=by)
+    rng = np.random.default_rng(seed)
+
+    home_n = home_counts.sum(axis=1)
+    away_n = away_counts.sum(axis=1)
+    home_ppg = np.divide(home_counts @ POINT_VALUES, home_n, out=np.zeros(len(keys)), where=home_n > 0)
+    away_ppg = np.divide(away_counts @ POINT_VALUES, away_n, out=np.zeros(len(keys)), where=away_n > 0)
+    gap = home_ppg - away_ppg
+
+    boot_gap = _resampled_ppg(home_counts, n_boot, rng) - _resampled_ppg(away_counts, n_boot, rng)
+
+    ci_low, ci_high = np.quantile(boot_gap, [alpha / 2, 1 - alpha / 2], axis=0)
+
+    # bajo H0 la distribución del gap se centra en 0
+    extreme = np.abs(boot_gap - gap) >= np.abs(gap)
+    p_value = (extreme.sum(axis=0) + 1) / (n_boot + 1)
+
+    out = keys.copy()
+    out["home_matches"] = home_n
+    out["away_matches"] = away_n
+    out["home_ppg"] = home_ppg
+    out["away_ppg"] = away_ppg
+    out["ppg_gap"] = gap
+    out["ci_low"] = ci_low
+    out["ci_high"] = ci_high
+    out["p_value"] = p_value
+    out["significant"] = p_value < alpha
+    return out
+
+
+def main():
+    df = read_dataset(FIXTURES_DATASET)
+
+    t0 = time.perf_counter()
+    res = bootstrap_ppg_gap(df)
+    dt = time.perf_counter() - t0
+
+    print(f"\n📊 BOOTSTRAP GAP PPG ({N_BOOT} re-muestreos) – {dt * 1000:.1f} ms")
+    print(res.sort_values("ppg_gap", ascending=False)
+             [["team", "ppg_gap", "ci_low", "ci_high", "p_value", "significant"]]
+             .to_string(index=False, float_format="%.3f"))
+
+    # escala: muchas ligas a la vez (se replica el CSV con otra clave de liga)
+    n_leagues = 100
+    many = pd.concat([df.assign(league_id=i) for i in range(n_leagues)], ignore_index=True)
+    t0 = time.perf_counter()
+    res = bootstrap_ppg_gap(many, by=["league_id"])
+    dt = time.perf_counter() - t0
+    print(f"\n>>> {n_leagues} ligas | {len(res)} equipos | {N_BOOT} re-muestreos: {dt:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+report_cards.py
+
+Tarjeta de una página por equipo (y por liga-temporada), renderizada en lote.
+
+- Calcula los datos de todas las tarjetas en un solo paso (pandas, sin loop por equipo)
+- Cada proceso del pool construye la plantilla UNA vez; el fondo estático se
+  dibuja una vez por liga-temporada y por equipo solo se dibujan los datos
+- Layout fijo: se guarda sin bbox_inches="tight"
+- --benchmark reporta tarjetas por segundo (plantilla vs. figura desde cero)
+
+Uso (desde SoccerData/):
+  python src/report_cards.py
+  python src/report_cards.py --benchmark --leagues 20
+"""
+
+import argparse
+import os
+import re
+import time
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from chart_template import FigureTemplate, clean_axes, BRAND_GREEN
+from storage import FIXTURES_DATASET, read_dataset
+
+OUT_DIR = "data/cards"
+
+CARD_DPI = 120
+
+
+# ==========================
+# DATOS DE LAS TARJETAS
+# ==========================
+
+def card_data(df, by=None):
+    """
+    Una fila por equipo (y grupo) con todo lo que muestra la tarjeta.
+    `by` permite muchas ligas-temporadas a la vez (ej. ["league_id", "season"]).
+    """
+    by = list(by or [])
+
+    df = df[df["status"] == "FT"].copy()
+    df["home_goals"] = pd.to_numeric(df["home_goals"], errors="coerce")
+    df["away_goals"] = pd.to_numeric(df["away_goals"], errors="coerce")
+    df = df.dropna(subset=["home_goals", "away_goals"])
+    df["date"] = pd.to_datetime(df["date"], errors="coerce", utc=True)
+    df = df.sort_values("date", kind="stable")
+
+    # formato largo: una fila por equipo y partido
+    long = pd.concat([
+        df[by + ["date"]].assign(team=df["home_team"].to_numpy(), gf=df["home_goals"].to_numpy(),
+                                 ga=df["away_goals"].to_numpy(), home=True),
+        df[by + ["date"]].assign(team=df["away_team"].to_numpy(), gf=df["away_goals"].to_numpy(),
+                                 ga=df["home_goals"].to_numpy(), home=False),
+    ], ignore_index=True).sort_values(by + ["date"], kind="stable")
+
+    long["pts"] = np.select([long["gf"] > long["ga"], long["gf"] == long["ga"]], [3, 1], 0)
+    long["home_pts"] = long["pts"].where(long["home"])
+    long["away_pts"] = long["pts"].where(~long["home"])
+    long["win"] = long["pts"] == 3
+    long["draw"] = long["pts"] == 1
+    long["loss"] = long["pts"] == 0
+
+    keys = by + ["team"]
+    g = long.groupby(keys, sort=True)
+    cards = g.agg(
+        MP=("pts", "size"),
+        W=("win", "sum"),
+        D=("draw", "sum"),
+        L=("loss", "sum"),
+        PTS=("pts", "sum"),
+        GF=("gf", "sum"),
+        GA=("ga", "sum"),
+        home_ppg=("home_pts", "mean"),
+        away_ppg=("away_pts", "mean"),
+    ).fillna({"home_ppg": 0, "away_ppg": 0}).reset_index()
+
+    cards["gf_pm"] = cards["GF"] / cards["MP"]
+    cards["ga_pm"] = cards["GA"] / cards["MP"]
+    cards["GD"] = cards["GF"] - cards["GA"]
+
+    # puntos acumulados: cumsum por equipo y un corte por equipo (mismo orden que cards)
+    long["cum_pts"] = g["pts"].cumsum()
+    cum = long.sort_values(keys, kind="stable")["cum_pts"].to_numpy()
+    cards["cum_pts"] = pd.Series(np.split(cum, np.cumsum(cards["MP"].to_numpy()))[:-1],
+                                 index=cards.index, dtype=object)
+
+    # contexto de liga (por grupo)
+    grp = cards.groupby(by) if by else cards.groupby(np.zeros(len(cards)))
+    cards["league_gf_pm"] = grp["GF"].transform("sum") / grp["MP"].transform("sum")
+    cards["max_mp"] = grp["MP"].transform("max")
+    cards["max_result"] = cards[["W", "D", "L"]].max(axis=1).groupby(grp.ngroup()).transform("max")
+    cards["max_pts"] = grp["PTS"].transform("max")
+    cards["max_goals_pm"] = np.maximum(grp["gf_pm"].transform("max"), grp["ga_pm"].transform("max"))
+    cards["n_teams"] = grp["team"].transform("size")
+
+    # posición: orden lexicográfico PTS > DG > GF; empates exactos comparten posición
+    order = cards.sort_values(by + ["PTS", "GD", "GF"], ascending=[True] * len(by) + [False] * 3,
+                              kind="stable")
+    pos = (order.groupby(by).cumcount() if by else pd.Series(np.arange(len(order)), index=order.index)) + 1
+    cards["position"] = pos.groupby([cards[c] for c in by + ["PTS", "GD", "GF"]]).transform("min")
+    return cards
+
+
+def card_path(out_dir, card, by):
+    group = "_".join(str(card[c]) for c in by) if by else "liga"
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", card["team"]).strip("_")
+    return os.path.join(out_dir, group, f"{slug}.png")
+
+
+# ==========================
+# PLANTILLA
+# ==========================
+
+class TeamCardTemplate(FigureTemplate):
+    """Tarjeta de equipo: resultados, PPG local/visita, goles por partido y puntos acumulados."""
+
+    figsize = (8, 10)
+    dpi = CARD_DPI
+
+    def build(self):
+        fig = self.fig
+        fig.patch.set_facecolor("white")
+        dyn = self.dynamic
+
+        self.title = dyn(fig.text(0.06, 0.955, "", fontsize=20, fontweight="bold", va="center"))
+        self.subtitle = dyn(fig.text(0.06, 0.92, "", fontsize=11, color="#444444", va="center"))
+
+        # --- Resultados (V / E / D) ---
+        self.ax_res = fig.add_axes([0.08, 0.63, 0.38, 0.23])
+        clean_axes(self.ax_res)
+        self.ax_res.set_title("Resultados", fontsize=12, fontweight="bold")
+        self.res_bars = [dyn(b) for b in self.ax_res.bar(["V", "E", "D"], [0, 0, 0],
+                                                         color=["#1B4332", "#3A5A40", "#A9C5B8"])]
+        self.res_labels = [dyn(self.ax_res.text(i, 0, "", ha="center", va="bottom", fontsize=10,
+                                                fontweight="bold")) for i in range(3)]
+
+        # --- PPG local / visita ---
+        self.ax_ven = fig.add_axes([0.58, 0.63, 0.36, 0.23])
+        clean_axes(self.ax_ven)
+        self.ax_ven.set_title("Puntos por partido", fontsize=12, fontweight="bold")
+        self.ax_ven.set_ylim(0, 3.3)
+        self.ven_bars = [dyn(b) for b in self.ax_ven.bar(["Local", "Visita"], [0, 0],
+                                                         color=[BRAND_GREEN, "#A9C5B8"])]
+        self.ven_labels = [dyn(self.ax_ven.text(i, 0, "", ha="center", va="bottom", fontsize=10,
+                                                fontweight="bold")) for i in range(2)]
+
+        # --- Goles por partido vs promedio de liga ---
+        self.ax_goals = fig.add_axes([0.12, 0.36, 0.82, 0.19])
+        clean_axes(self.ax_goals, grid_axis="x")
+        self.ax_goals.set_title("Goles por partido (línea: promedio de liga)", fontsize=12, fontweight="bold")
+        self.goal_bars = [dyn(b) for b in self.ax_goals.barh(["Concedidos", "Anotados"], [0, 0],
+                                                             color=["#A9C5B8", BRAND_GREEN])]
+        self.league_line = dyn(self.ax_goals.axvline(0, color="#555555", linestyle="--", linewidth=1))
+        self.goal_labels = [dyn(self.ax_goals.text(0, i, "", va="center", fontsize=10, fontweight="bold"))
+                            for i in range(2)]
+
+        # --- Puntos acumulados ---
+        self.ax_pts = fig.add_axes([0.08, 0.12, 0.86, 0.17])
+        clean_axes(self.ax_pts)
+        self.ax_pts.set_title("Puntos acumulados (punteada: ritmo de 1.5 PPG)", fontsize=12, fontweight="bold")
+        self.ax_pts.set_xlabel("Partido")
+        self.pts_line = dyn(self.ax_pts.plot([], [], color=BRAND_GREEN, linewidth=2)[0])
+        self.pace_line = dyn(self.ax_pts.plot([], [], color="#999999", linestyle=":", linewidth=1)[0])
+
+        self.insight = self.insight_box(0.5, 0.045, ha="center", va="center", fontsize=10)
+
+    def layout_key(self, c):
+        # límites compartidos por toda la liga-temporada: el fondo se reutiliza
+        return (c["max_mp"], c["max_result"], c["max_pts"], round(c["max_goals_pm"], 2))
+
+    def apply_layout(self, c):
+        # desde los máximos de la liga: ningún equipo (ni un campeón invicto) se corta
+        max_mp = max(c["max_mp"], 1)
+        self.ax_res.set_ylim(0, max(c["max_result"], 1) * 1.2)
+        self.ax_goals.set_xlim(0, c["max_goals_pm"] * 1.2)
+        self.ax_pts.set_xlim(0, max_mp + 1)
+        self.ax_pts.set_ylim(0, max(c["max_pts"], max_mp * 1.5, 1) * 1.1)
+
+    def update(self, c):
+        self.title.set_text(c["team"])
+        self.subtitle.set_text(
+            f"Posición {c['position']} de {c['n_teams']} | PTS {c['PTS']} | PJ {c['MP']} | "
+            f"GF {int(c['GF'])} | GC {int(c['GA'])} | DG {int(c['GD']):+d}"
+        )
+
+        for bar, label, v in zip(self.res_bars, self.res_labels, (c["W"], c["D"], c["L"])):
+            bar.set_height(v)
+            label.set_position((label.get_position()[0], v))
+            label.set_text(f"{v}")
+
+        for bar, label, v in zip(self.ven_bars, self.ven_labels, (c["home_ppg"], c["away_ppg"])):
+            bar.set_height(v)
+            label.set_position((label.get_position()[0], v + 0.05))
+            label.set_text(f"{v:.2f}")
+
+        for bar, label, v in zip(self.goal_bars, self.goal_labels, (c["ga_pm"], c["gf_pm"])):
+            bar.set_width(v)
+            label.set_position((v + 0.03, label.get_position()[1]))
+            label.set_text(f"{v:.2f}")
+        self.league_line.set_xdata([c["league_gf_pm"]] * 2)
+
+        cum = c["cum_pts"]
+        x = np.arange(1, len(cum) + 1)
+        self.pts_line.set_data(x, cum)
+        self.pace_line.set_data(x, x * 1.5)
+
+        gap = c["home_ppg"] - c["away_ppg"]
+        text = (f"Insight: {c['team']} suma {c['PTS'] / c['MP']:.2f} PPG "
+                f"({gap:+.2f} en casa vs. fuera) y anota "
+                f"{c['gf_pm'] - c['league_gf_pm']:+.2f} goles por partido respecto al promedio de liga.")
+        self.insight.set_text("\n".join(textwrap.wrap(text, width=80)))
+
+
+# ==========================
+# RENDER EN LOTE
+# ==========================
+
+_template = None
+
+
+def _init_worker():
+    global _template
+    _template = TeamCardTemplate()
+
+
+def _render_chunk(jobs):
+    for card, path in jobs:
+        _template.render(card, path)
+    return len(jobs)
+
+
+def render_cards(cards, out_dir=OUT_DIR, by=None, processes=None):
+    """
+    Renderiza todas las tarjetas en un process pool.
+    Cada proceso construye su plantilla una sola vez (initializer).
+    Retorna la cantidad de tarjetas generadas.
+    """
+    by = list(by or [])
+    jobs = []
+    for card in cards.to_dict("records"):
+        path = card_path(out_dir, card, by)
+        jobs.append((card, path))
+    if not jobs:
+        return 0
+    for d in {os.path.dirname(p) for _, p in jobs}:
+        os.makedirs(d, exist_ok=True)
+
+    workers = processes or os.cpu_count() or 1
+    n_chunks = workers * 4
+    # bloques contiguos: las tarjetas de una misma liga caen en el mismo
+    # proceso y reutilizan el fondo ya dibujado
+    size = -(-len(jobs) // n_chunks)
+    chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+
+    if workers == 1:
+        _init_worker()
+        return sum(_render_chunk(ch) for ch in chunks)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return sum(pool.map(_render_chunk, chunks))
+
+
+def _render_from_scratch(card, path):
+    """Referencia para el benchmark: figura nueva por tarjeta + bbox tight."""
+    t = TeamCardTemplate()
+    for artist in t._dynamic:
+        artist.set_animated(False)
+    t.apply_layout(card)
+    t.update(card)
+    t.fig.savefig(path, dpi=CARD_DPI, bbox_inches="tight")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tarjetas por equipo en lote.")
+    parser.add_argument("--csv", help="CSV de fixtures (por defecto, la versión actual del dataset)")
+    parser.add_argument("--out-dir", default=OUT_DIR)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--leagues", type=int, default=1,
+                        help="(benchmark) replica el CSV como N ligas para medir a escala")
+    args = parser.parse_args()
+
+    df = read_dataset(FIXTURES_DATASET) if args.csv is None else pd.read_csv(args.csv)
+    by = None
+    if args.leagues > 1:
+        df = pd.concat([df.assign(league_id=i) for i in range(args.leagues)], ignore_index=True)
+        by = ["league_id"]
+
+    t0 = time.perf_counter()
+    cards = card_data(df, by=by)
+    print(f">>> Datos de {len(cards)} tarjetas en {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    t0 = time.perf_counter()
+    n = render_cards(cards, out_dir=args.out_dir, by=by, processes=args.processes)
+    dt = time.perf_counter() - t0
+    print(f">>> {n} tarjetas en {dt:.2f} s | {n / dt:.1f} tarjetas/s (plantilla + pool)")
+
+    if args.benchmark:
+        sample = cards.head(min(len(cards), 24)).to_dict("records")
+        paths = [card_path(args.out_dir, c, by or []) for c in sample]
+
+        t0 = time.perf_counter()
+        for c, p in zip(sample, paths):
+            _render_from_scratch(c, p)
+        dt_scratch = time.perf_counter() - t0
+
+        _init_worker()
+        t0 = time.perf_counter()
+        _render_chunk(list(zip(sample, paths)))
+        dt_tpl = time.perf_counter() - t0
+
+        print(f">>> 1 proceso | desde cero + bbox tight: {len(sample) / dt_scratch:.1f} tarjetas/s | "
+              f"plantilla: {len(sample) / dt_tpl:.1f} tarjetas/s")
+
+
+if __name__ == "__main__":
+    main()
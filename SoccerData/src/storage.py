@@ -0,0 +1,209 @@
+"""
+storage.py
+
+Capa de almacenamiento segura para procesos concurrentes sobre data/.
+
+- Escrituras atómicas: se escribe a un archivo temporal en la misma carpeta
+  y se renombra con os.replace (un lector nunca ve un archivo a medias)
+- Locks de lectura/escritura entre procesos por dataset (fcntl.flock en
+  Linux/macOS; en Windows msvcrt, donde el lock de lectura también es exclusivo)
+- Datasets versionados: data/versions/<dataset>/v000001.csv, v000002.csv, ...
+  y un puntero CURRENT que se actualiza atómicamente. Los lectores siempre
+  leen una versión completa y consistente
+- La última versión también se publica en la ruta "plana" de siempre
+  (ej. data/primera_division_2024_fixtures.csv) para no romper scripts existentes
+
+Uso:
+  write_dataset(FIXTURES_DATASET, df)
+  df = read_dataset(FIXTURES_DATASET)
+  atomic_savefig(fig, "data/grafico.png", dpi=300)
+"""
+
+import os
+import re
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DATA_DIR = "data"
+VERSIONS_DIR = "versions"
+LOCKS_DIR = ".locks"
+KEEP_VERSIONS = 5
+
+FIXTURES_DATASET = "primera_division_2024_fixtures"
+
+_VERSION_RE = re.compile(r"^v(\d{6})\.csv$")
+
+
+# ==========================
+# ESCRITURA ATÓMICA
+# ==========================
+
+def _tmp_path(path):
+    """Temporal en la misma carpeta (mismo filesystem) y con la misma extensión."""
+    folder, base = os.path.split(path)
+    stem, ext = os.path.splitext(base)
+    return os.path.join(folder, f".{stem}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp{ext}")
+
+
+def atomic_write(path, write_fn):
+    """
+    Llama write_fn(tmp_path) y luego reemplaza `path` atómicamente.
+    Si write_fn falla, `path` queda intacto y el temporal se borra.
+    """
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    tmp = _tmp_path(path)
+    try:
+        write_fn(tmp)
+        with open(tmp, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def atomic_write_text(path, text):
+    def write(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+    atomic_write(path, write)
+
+
+def atomic_savefig(fig, path, **kwargs):
+    """fig.savefig atómico (PNG, GIF, etc.; el formato sale de la extensión)."""
+    atomic_write(path, lambda tmp: fig.savefig(tmp, **kwargs))
+
+
+# ==========================
+# LOCKS ENTRE PROCESOS
+# ==========================
+
+def _lock_file(f, exclusive):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        return
+
+    # msvcrt solo tiene locks exclusivos; LK_LOCK se rinde a los ~10 s
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(0.05)
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def dataset_lock(name, exclusive=True, data_dir=DATA_DIR):
+    """
+    Lock por dataset (o por artefacto) entre procesos.
+    exclusive=False: lectura compartida | exclusive=True: escritura.
+    """
+    lock_dir = os.path.join(data_dir, LOCKS_DIR)
+    os.makedirs(lock_dir, exist_ok=True)
+
+    with open(os.path.join(lock_dir, f"{name}.lock"), "a+b") as f:
+        _lock_file(f, exclusive)
+        try:
+            yield
+        finally:
+            _unlock_file(f)
+
+
+# ==========================
+# DATASETS VERSIONADOS
+# ==========================
+
+def _versions_dir(name, data_dir):
+    return os.path.join(data_dir, VERSIONS_DIR, name)
+
+
+def list_versions(name, data_dir=DATA_DIR):
+    folder = _versions_dir(name, data_dir)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(int(m.group(1)) for m in map(_VERSION_RE.match, os.listdir(folder)) if m)
+
+
+def _current_version(name, data_dir):
+    pointer = os.path.join(_versions_dir(name, data_dir), "CURRENT")
+    if not os.path.exists(pointer):
+        return None
+    with open(pointer, encoding="utf-8") as f:
+        return int(f.read().strip())
+
+
+def dataset_path(name, version=None, data_dir=DATA_DIR):
+    """
+    Ruta de una versión (por defecto la actual). Si el dataset todavía no
+    tiene versiones, se usa el archivo plano data/<name>.csv.
+    """
+    if version is None:
+        version = _current_version(name, data_dir)
+    if version is None:
+        return os.path.join(data_dir, f"{name}.csv")
+    return os.path.join(_versions_dir(name, data_dir), f"v{version:06d}.csv")
+
+
+def read_dataset(name, version=None, data_dir=DATA_DIR, **read_kwargs):
+    """Lee una versión completa del dataset bajo lock de lectura."""
+    with dataset_lock(name, exclusive=False, data_dir=data_dir):
+        return pd.read_csv(dataset_path(name, version, data_dir), **read_kwargs)
+
+
+def write_dataset(name, df, data_dir=DATA_DIR, keep=KEEP_VERSIONS, publish=True):
+    """
+    Escribe una nueva versión del dataset y la marca como actual.
+    - El CSV se escribe fuera del lock (archivo temporal único)
+    - Bajo lock exclusivo: se numera, se renombra, se mueve CURRENT,
+      se publica la ruta plana y se borran versiones viejas (> keep)
+    Retorna el número de versión.
+    """
+    folder = _versions_dir(name, data_dir)
+    os.makedirs(folder, exist_ok=True)
+
+    tmp = _tmp_path(os.path.join(folder, "staged.csv"))
+    try:
+        df.to_csv(tmp, index=False)
+        with open(tmp, "rb+") as f:
+            os.fsync(f.fileno())
+
+        with dataset_lock(name, exclusive=True, data_dir=data_dir):
+            versions = list_versions(name, data_dir)
+            version = (versions[-1] if versions else 0) + 1
+            path = dataset_path(name, version, data_dir)
+
+            os.replace(tmp, path)
+            atomic_write_text(os.path.join(folder, "CURRENT"), f"{version}\n")
+
+            if publish:
+                flat = os.path.join(data_dir, f"{name}.csv")
+                atomic_write(flat, lambda t: df.to_csv(t, index=False))
+
+            for old in versions[:max(0, len(versions) + 1 - keep)]:
+                os.remove(dataset_path(name, old, data_dir))
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    return version
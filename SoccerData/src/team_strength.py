@@ -0,0 +1,273 @@
+"""
+team_strength.py
+
+Fuerza de equipos ajustada por rival y localía (Poisson / Dixon-Coles).
+
+Modelo por liga-temporada:
+  goles local  ~ Poisson(lambda = exp(mu + home + attack[local]  + defense[visita]))
+  goles visita ~ Poisson(lambda = exp(mu +        attack[visita] + defense[local]))
+
+- attack > 0: anota más que el promedio | defense > 0: concede más que el promedio
+- Corrección Dixon-Coles opcional (rho) para marcadores bajos: 0-0, 1-0, 0-1, 1-1
+- Ponderación opcional por antigüedad del partido: w = exp(-xi * días)
+- Log-verosimilitud y gradiente analítico vectorizados sobre los arrays de fixtures
+- Caché de parámetros por hash de los fixtures de entrada (+ opciones del modelo)
+- fit_many: ajusta muchas ligas-temporadas en paralelo (process pool)
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+from scipy.special import gammaln
+
+from storage import FIXTURES_DATASET, read_dataset, atomic_write_text
+
+CACHE_DIR = "data/cache/team_strength"
+
+XI = 0.0019          # decaimiento por día (vida media ~1 año)
+RHO_BOUNDS = (-0.2, 0.2)
+TAU_MIN = 1e-10      # piso para log(tau) si rho lleva tau a <= 0
+
+
+# ==========================
+# DATOS
+# ==========================
+
+def fixture_arrays(df):
+    """
+    Partidos FT de UNA liga-temporada -> arrays para el modelo.
+    Retorna (teams, home_idx, away_idx, home_goals, away_goals, days_ago).
+    """
+    df = df[df["status"] == "FT"].copy()
+    df["home_goals"] = pd.to_numeric(df["home_goals"], errors="coerce")
+    df["away_goals"] = pd.to_numeric(df["away_goals"], errors="coerce")
+    df = df.dropna(subset=["home_goals", "away_goals"])
+
+    teams = np.sort(pd.unique(df[["home_team", "away_team"]].values.ravel()))
+    home_idx = np.searchsorted(teams, df["home_team"].to_numpy())
+    away_idx = np.searchsorted(teams, df["away_team"].to_numpy())
+
+    dates = pd.to_datetime(df["date"], errors="coerce", utc=True)
+    days_ago = ((dates.max() - dates).dt.total_seconds() / 86400).fillna(0).to_numpy()
+
+    return (teams, home_idx, away_idx,
+            df["home_goals"].to_numpy(dtype=float), df["away_goals"].to_numpy(dtype=float),
+            days_ago)
+
+
+def fixtures_hash(df, dixon_coles=True, xi=None):
+    """
+    Hash estable de los fixtures FT (independiente del orden de filas) y de
+    las opciones del modelo. Es la llave de la caché de parámetros.
+    """
+    cols = ["date", "home_team", "away_team", "home_goals", "away_goals"]
+    ft = df.loc[df["status"] == "FT", cols].astype(str).sort_values(cols).reset_index(drop=True)
+
+    h = hashlib.sha1(pd.util.hash_pandas_object(ft, index=False).values.tobytes())
+    h.update(f"dc={bool(dixon_coles)}|xi={xi}".encode())
+    return h.hexdigest()
+
+
+# ==========================
+# VEROSIMILITUD + GRADIENTE
+# ==========================
+
+def neg_log_likelihood(params, home_idx, away_idx, hg, ag, weights, n_teams, dixon_coles=True):
+    """
+    -log L ponderada y su gradiente analítico (todo vectorizado con bincount).
+    params = [attack (T), defense (T), mu, home, rho]
+    Incluye una penalización (sum attack)^2 + (sum defense)^2 que fija la
+    identificabilidad sin cambiar el óptimo de la verosimilitud.
+    """
+    T = n_teams
+    attack, defense = params[:T], params[T:2 * T]
+    mu, home, rho = params[2 * T], params[2 * T + 1], params[2 * T + 2]
+
+    log_lam = mu + home + attack[home_idx] + defense[away_idx]
+    log_nu = mu + attack[away_idx] + defense[home_idx]
+    lam, nu = np.exp(log_lam), np.exp(log_nu)
+
+    ll = hg * log_lam - lam - gammaln(hg + 1) + ag * log_nu - nu - gammaln(ag + 1)
+
+    # derivadas de ll respecto a log(lambda) y log(nu)
+    d_log_lam = hg - lam
+    d_log_nu = ag - nu
+    d_rho = 0.0
+
+    if dixon_coles:
+        tau = np.ones_like(lam)
+        dtau_dlam = np.zeros_like(lam)
+        dtau_dnu = np.zeros_like(lam)
+        dtau_drho = np.zeros_like(lam)
+
+        s00 = (hg == 0) & (ag == 0)
+        s01 = (hg == 0) & (ag == 1)
+        s10 = (hg == 1) & (ag == 0)
+        s11 = (hg == 1) & (ag == 1)
+
+        tau[s00] = 1 - lam[s00] * nu[s00] * rho
+        dtau_dlam[s00] = -nu[s00] * rho
+        dtau_dnu[s00] = -lam[s00] * rho
+        dtau_drho[s00] = -lam[s00] * nu[s00]
+
+        tau[s01] = 1 + lam[s01] * rho
+        dtau_dlam[s01] = rho
+        dtau_drho[s01] = lam[s01]
+
+        tau[s10] = 1 + nu[s10] * rho
+        dtau_dnu[s10] = rho
+        dtau_drho[s10] = nu[s10]
+
+        tau[s11] = 1 - rho
+        dtau_drho[s11] = -1.0
+
+        tau = np.maximum(tau, TAU_MIN)
+        ll = ll + np.log(tau)
+        d_log_lam = d_log_lam + lam * dtau_dlam / tau
+        d_log_nu = d_log_nu + nu * dtau_dnu / tau
+        d_rho = np.sum(weights * dtau_drho / tau)
+
+    g_lam = weights * d_log_lam
+    g_nu = weights * d_log_nu
+
+    grad = np.empty_like(params)
+    grad[:T] = np.bincount(home_idx, g_lam, T) + np.bincount(away_idx, g_nu, T)
+    grad[T:2 * T] = np.bincount(away_idx, g_lam, T) + np.bincount(home_idx, g_nu, T)
+    grad[2 * T] = g_lam.sum() + g_nu.sum()
+    grad[2 * T + 1] = g_lam.sum()
+    grad[2 * T + 2] = d_rho
+
+    sa, sd = attack.sum(), defense.sum()
+    value = -np.sum(weights * ll) + sa ** 2 + sd ** 2
+
+    grad = -grad
+    grad[:T] += 2 * sa
+    grad[T:2 * T] += 2 * sd
+    return value, grad
+
+
+# ==========================
+# AJUSTE
+# ==========================
+
+def _fit_arrays(teams, home_idx, away_idx, hg, ag, days_ago, dixon_coles=True, xi=None):
+    T = len(teams)
+    weights = np.exp(-xi * days_ago) if xi else np.ones_like(hg)
+
+    x0 = np.zeros(2 * T + 3)
+    x0[2 * T] = np.log(max((hg.mean() + ag.mean()) / 2, 1e-3))
+
+    bounds = [(None, None)] * (2 * T + 2) + [RHO_BOUNDS if dixon_coles else (0.0, 0.0)]
+
+    res = minimize(
+        neg_log_likelihood, x0, jac=True, method="L-BFGS-B", bounds=bounds,
+        args=(home_idx, away_idx, hg, ag, weights, T, dixon_coles),
+    )
+
+    p = res.x
+    return {
+        "teams": pd.DataFrame({
+            "team": teams,
+            "attack": p[:T],
+            "defense": p[T:2 * T],
+        }).assign(strength=lambda d: d["attack"] - d["defense"])
+          .sort_values("strength", ascending=False, ignore_index=True),
+        "intercept": float(p[2 * T]),
+        "home_adv": float(p[2 * T + 1]),
+        "rho": float(p[2 * T + 2]),
+        "neg_log_lik": float(res.fun),
+        "converged": bool(res.success),
+        "n_matches": int(len(hg)),
+    }
+
+
+def _to_json(result):
+    out = dict(result)
+    out["teams"] = result["teams"].to_dict("records")
+    return out
+
+
+def _from_json(data):
+    out = dict(data)
+    out["teams"] = pd.DataFrame(data["teams"])
+    return out
+
+
+def fit_team_strength(df, dixon_coles=True, xi=None, cache_dir=CACHE_DIR):
+    """
+    Ajusta attack / defense / home_adv (y rho) para UNA liga-temporada.
+    Con cache_dir, los parámetros se guardan/leen por hash de los fixtures.
+    """
+    key = fixtures_hash(df, dixon_coles=dixon_coles, xi=xi)
+
+    if cache_dir:
+        path = os.path.join(cache_dir, f"{key}.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return _from_json(json.load(f))
+
+    result = _fit_arrays(*fixture_arrays(df), dixon_coles=dixon_coles, xi=xi)
+    result["hash"] = key
+
+    if cache_dir:
+        atomic_write_text(path, json.dumps(_to_json(result)))
+
+    return result
+
+
+def _fit_group(args):
+    key, group, dixon_coles, xi, cache_dir = args
+    return key, fit_team_strength(group, dixon_coles=dixon_coles, xi=xi, cache_dir=cache_dir)
+
+
+def fit_many(df, by, dixon_coles=True, xi=None, cache_dir=CACHE_DIR, processes=None):
+    """
+    Ajusta cada grupo (ej. by=["league_id", "season"]) en un process pool.
+    Retorna dict {clave de grupo: resultado}.
+    """
+    jobs = [(key, group, dixon_coles, xi, cache_dir) for key, group in df.groupby(by, sort=False)]
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        chunksize = max(1, len(jobs) // (4 * (processes or os.cpu_count() or 1)))
+        return dict(pool.map(_fit_group, jobs, chunksize=chunksize))
+
+
+def main():
+    df = read_dataset(FIXTURES_DATASET)
+
+    t0 = time.perf_counter()
+    res = fit_team_strength(df, xi=XI, cache_dir=None)
+    dt = time.perf_counter() - t0
+
+    print(f"\n📊 FUERZA DE EQUIPOS (Dixon-Coles, xi={XI}) – {dt * 1000:.1f} ms")
+    print(res["teams"].to_string(index=False, float_format="%.3f"))
+    print(f"Localía: {res['home_adv']:.3f} | rho: {res['rho']:.3f} | convergió: {res['converged']}")
+
+    # escala: muchas ligas-temporadas simuladas (goles re-muestreados por Poisson)
+    n_groups = 300
+    rng = np.random.default_rng(2024)
+    ft = df[df["status"] == "FT"]
+    many = pd.concat([
+        ft.assign(
+            league_id=i,
+            home_goals=rng.poisson(ft["home_goals"].mean(), len(ft)),
+            away_goals=rng.poisson(ft["away_goals"].mean(), len(ft)),
+        )
+        for i in range(n_groups)
+    ], ignore_index=True)
+
+    t0 = time.perf_counter()
+    fits = fit_many(many, by="league_id", xi=XI, cache_dir=None)
+    dt = time.perf_counter() - t0
+    print(f"\n>>> {len(fits)} ligas-temporadas en paralelo: {dt:.2f} s "
+          f"({dt / len(fits) * 1000:.1f} ms por ajuste)")
+
+
+if __name__ == "__main__":
+    main()
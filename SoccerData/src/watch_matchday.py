@@ -0,0 +1,320 @@
+"""
+watch_matchday.py
+
+Modo "en vivo" para una jornada.
+
+- Descarga la temporada UNA vez al arrancar (igual que fetch_fixtures.py)
+- Luego solo consulta partidos en juego (live) y los recién finalizados (ids)
+- Cada resultado FT se aplica como delta sobre la tabla y los agregados por equipo
+  (si un marcador se corrige, se resta el aporte anterior y se suma el nuevo)
+- Solo se re-generan los gráficos cuyas filas de entrada cambiaron
+- El gráfico local/visita incluye el IC bootstrap, igual que analyze_home_away.py
+
+Uso con el mock (desde SoccerData/):
+  python src/mock_api.py --round "Clausura - 22" --speed 60
+  BASE_URL=http://127.0.0.1:8765 APISPORTS_KEY=mock python src/watch_matchday.py --until-idle
+"""
+
+import argparse
+import hashlib
+import os
+import time
+
+import matplotlib
+matplotlib.use("Agg")  # sin ventanas: los gráficos solo se guardan
+
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from api_client import api_get
+from fetch_fixtures import LEAGUE_ID, SEASON, TIMEZONE, fixture_to_row
+from animate_standings import points, sort_table
+import analyze_fixtures
+import analyze_teams
+import analyze_home_away
+from ppg_bootstrap import bootstrap_ppg_gap
+from storage import atomic_savefig
+
+POLL_SECONDS = 10
+OUT_DIR = "data"
+MAX_IDS_PER_REQUEST = 20  # límite de API-Football para el parámetro ids
+
+FINISHED_STATUS = "FT"  # mismo criterio que los scripts de análisis
+LIVE_STATUSES = {"1H", "HT", "2H", "ET", "BT", "P", "LIVE", "INT", "SUSP"}
+
+TABLE_COLUMNS = ["MP", "W", "D", "L", "GF", "GA", "GD", "PTS",
+                 "HMP", "HPTS", "AMP", "APTS"]
+
+
+# ==========================
+# TABLA CON DELTAS
+# ==========================
+
+def empty_table(teams):
+    return pd.DataFrame(0, index=pd.Index(teams, name="team"), columns=TABLE_COLUMNS)
+
+
+def apply_result(table, home_team, away_team, hg, ag, sign=1):
+    """
+    Suma (sign=1) o resta (sign=-1) el aporte de un resultado a la tabla.
+    Solo toca las filas de los dos equipos involucrados.
+    """
+    for team in (home_team, away_team):
+        if team not in table.index:
+            table.loc[team] = 0
+
+    hp = points(hg, ag, "home")
+    ap = points(hg, ag, "away")
+
+    table.loc[home_team, ["MP", "GF", "GA", "PTS", "HMP", "HPTS"]] += [sign, sign * hg, sign * ag, sign * hp, sign, sign * hp]
+    table.loc[away_team, ["MP", "GF", "GA", "PTS", "AMP", "APTS"]] += [sign, sign * ag, sign * hg, sign * ap, sign, sign * ap]
+
+    if hg > ag:
+        table.loc[home_team, "W"] += sign
+        table.loc[away_team, "L"] += sign
+    elif hg < ag:
+        table.loc[away_team, "W"] += sign
+        table.loc[home_team, "L"] += sign
+    else:
+        table.loc[home_team, "D"] += sign
+        table.loc[away_team, "D"] += sign
+
+    table.loc[[home_team, away_team], "GD"] = (
+        table.loc[[home_team, away_team], "GF"] - table.loc[[home_team, away_team], "GA"]
+    )
+
+
+def apply_fixture(table, applied, row):
+    """
+    Aplica una fila de fixture como delta. `applied` guarda el marcador
+    ya contado por match_id. Retorna True si la tabla cambió.
+    """
+    match_id = row["match_id"]
+    old = applied.get(match_id)
+
+    if row["status"] == FINISHED_STATUS and not pd.isna(row["home_goals"]) and not pd.isna(row["away_goals"]):
+        new = (row["home_team"], row["away_team"], int(row["home_goals"]), int(row["away_goals"]))
+    else:
+        new = None
+
+    if old == new:
+        return False
+
+    if old is not None:
+        apply_result(table, *old, sign=-1)
+    if new is not None:
+        apply_result(table, *new, sign=1)
+        applied[match_id] = new
+    else:
+        applied.pop(match_id, None)
+
+    return True
+
+
+# ==========================
+# ENTRADAS DE CADA GRÁFICO
+# ==========================
+
+def teams_view(table):
+    """Tabla con el formato de analyze_teams.build_teams_table."""
+    t = table[table["MP"] > 0]
+    df = pd.DataFrame({
+        "team": t.index,
+        "matches": t["MP"].values,
+        "goals_for": t["GF"].values,
+        "goals_against": t["GA"].values,
+        "goal_diff": t["GD"].values,
+        "goals_per_match": (t["GF"] / t["MP"]).values,
+    })
+    return df.sort_values(by="goals_for", ascending=False, kind="stable")
+
+
+def home_away_view(table):
+    """Tabla con el formato de analyze_home_away.build_home_away_table."""
+    t = table[table["MP"] > 0]
+    home_ppg = (t["HPTS"] / t["HMP"].where(t["HMP"] > 0)).fillna(0)
+    away_ppg = (t["APTS"] / t["AMP"].where(t["AMP"] > 0)).fillna(0)
+    return pd.DataFrame({
+        "team": t.index,
+        "home_matches": t["HMP"].values,
+        "away_matches": t["AMP"].values,
+        "home_points": t["HPTS"].values,
+        "away_points": t["APTS"].values,
+        "home_ppg": home_ppg.values,
+        "away_ppg": away_ppg.values,
+        "ppg_gap": (home_ppg - away_ppg).values,
+    })
+
+
+def results_view(applied):
+    """Conteos de liga (equivalentes a analyze_fixtures.compute_metrics) desde los deltas."""
+    n = len(applied)
+    total = n if n else 1
+    goals = [hg + ag for (_, _, hg, ag) in applied.values()]
+    home_wins = sum(1 for (_, _, hg, ag) in applied.values() if hg > ag)
+    away_wins = sum(1 for (_, _, hg, ag) in applied.values() if hg < ag)
+    draws = n - home_wins - away_wins
+    over_25 = sum(1 for g in goals if g > 2.5)
+    over_35 = sum(1 for g in goals if g > 3.5)
+    return {
+        "avg_goals": sum(goals) / total,
+        "home_wins": home_wins,
+        "away_wins": away_wins,
+        "draws": draws,
+        "total_matches": total,
+        "home_pct": home_wins / total * 100,
+        "away_pct": away_wins / total * 100,
+        "draw_pct": draws / total * 100,
+        "over_25": over_25,
+        "over_35": over_35,
+        "over25_pct": over_25 / total * 100,
+        "over35_pct": over_35 / total * 100,
+    }
+
+
+def significance_view(applied):
+    """
+    Bootstrap del gap PPG (igual que analyze_home_away) sobre los partidos FT
+    ya aplicados. Semilla fija: mismos partidos -> mismo IC y mismo hash.
+    """
+    ft = pd.DataFrame(list(applied.values()),
+                      columns=["home_team", "away_team", "home_goals", "away_goals"])
+    ft["status"] = FINISHED_STATUS
+    boot = bootstrap_ppg_gap(ft)
+    return boot[["team", "ci_low", "ci_high", "p_value", "significant"]]
+
+
+def chart_inputs(table, applied):
+    """
+    Filas que alimenta cada gráfico. Si el hash de estas filas no cambia,
+    el gráfico no se vuelve a generar.
+    """
+    home_away = home_away_view(table)
+    if applied:
+        home_away = home_away.merge(significance_view(applied), on="team", how="left")
+
+    return {
+        "resultados": pd.DataFrame([results_view(applied)]),
+        "top5": teams_view(table).head(5).reset_index(drop=True),
+        "home_away": home_away.sort_values("ppg_gap", ascending=False, kind="stable")
+                              .head(10).reset_index(drop=True),
+    }
+
+
+CHARTS = {
+    "resultados": (lambda rows: analyze_fixtures.plot_results(rows.iloc[0].to_dict()),
+                   os.path.basename(analyze_fixtures.OUT_PNG)),
+    "top5": (analyze_teams.plot_top5, os.path.basename(analyze_teams.OUT_PNG)),
+    "home_away": (analyze_home_away.plot_top10, os.path.basename(analyze_home_away.OUT_PNG)),
+}
+
+
+def fingerprint(rows):
+    return hashlib.sha1(pd.util.hash_pandas_object(rows, index=True).values.tobytes()).hexdigest()
+
+
+def render_changed(table, applied, fingerprints, out_dir):
+    """
+    Re-genera solo los gráficos cuyas filas de entrada cambiaron.
+    Retorna la lista de gráficos generados.
+    """
+    rendered = []
+    for name, rows in chart_inputs(table, applied).items():
+        fp = fingerprint(rows)
+        if fingerprints.get(name) == fp:
+            continue
+
+        plot, filename = CHARTS[name]
+        fig = plot(rows)
+        atomic_savefig(fig, os.path.join(out_dir, filename), dpi=300, bbox_inches="tight")
+        plt.close(fig)
+
+        fingerprints[name] = fp
+        rendered.append(name)
+    return rendered
+
+
+# ==========================
+# POLLING
+# ==========================
+
+def fetch_rows(params):
+    data = api_get("/fixtures", params=params)
+    return [fixture_to_row(m) for m in data.get("response", [])]
+
+
+def poll(live_ids):
+    """
+    Consulta los partidos en juego y los que estaban en juego en la
+    consulta anterior pero ya no (recién finalizados).
+    Retorna (filas, ids en juego ahora).
+    """
+    rows = fetch_rows({"live": str(LEAGUE_ID), "timezone": TIMEZONE})
+    now_live = {r["match_id"] for r in rows}
+
+    just_finished = sorted(live_ids - now_live)
+    for i in range(0, len(just_finished), MAX_IDS_PER_REQUEST):
+        chunk = just_finished[i:i + MAX_IDS_PER_REQUEST]
+        rows.extend(fetch_rows({"ids": "-".join(str(x) for x in chunk), "timezone": TIMEZONE}))
+
+    return rows, now_live
+
+
+def print_standings(table, top_n=8):
+    snap = sort_table(table[["MP", "W", "D", "L", "GF", "GA", "GD", "PTS"]])
+    print(snap.head(top_n).to_string(index=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modo en vivo: tabla y gráficos por deltas.")
+    parser.add_argument("--poll", type=float, default=POLL_SECONDS, help="segundos entre consultas")
+    parser.add_argument("--out-dir", default=OUT_DIR)
+    parser.add_argument("--until-idle", action="store_true",
+                        help="termina cuando ya no quedan partidos en juego")
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    # ---------- Arranque: temporada completa (una sola vez) ----------
+    print(">>> Cargando temporada inicial...")
+    season_rows = fetch_rows({"league": LEAGUE_ID, "season": SEASON, "timezone": TIMEZONE})
+    teams = pd.unique(pd.DataFrame(season_rows)[["home_team", "away_team"]].values.ravel())
+
+    table = empty_table(teams)
+    applied = {}
+    for row in season_rows:
+        apply_fixture(table, applied, row)
+
+    fingerprints = {}
+    rendered = render_changed(table, applied, fingerprints, args.out_dir)
+    print(f">>> Partidos FT: {len(applied)} | gráficos generados: {', '.join(rendered)}")
+    print_standings(table)
+
+    # ---------- Loop de jornada ----------
+    live_ids = {r["match_id"] for r in season_rows if r["status"] in LIVE_STATUSES}
+    seen_live = bool(live_ids)
+
+    try:
+        while True:
+            time.sleep(args.poll)
+            rows, live_ids = poll(live_ids)
+            seen_live = seen_live or bool(live_ids)
+
+            changed = [r for r in rows if apply_fixture(table, applied, r)]
+            for r in changed:
+                print(f">>> FT {r['home_team']} {r['home_goals']}-{r['away_goals']} {r['away_team']}")
+
+            if changed:
+                rendered = render_changed(table, applied, fingerprints, args.out_dir)
+                print(f">>> Gráficos actualizados: {', '.join(rendered) if rendered else 'ninguno'}")
+                print_standings(table)
+
+            if args.until_idle and seen_live and not live_ids:
+                print(">>> Sin partidos en juego. Fin del modo en vivo.")
+                break
+    except KeyboardInterrupt:
+        print("\n>>> Modo en vivo detenido.")
+
+
+if __name__ == "__main__":
+    main()